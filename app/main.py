@@ -2,11 +2,13 @@ from fastapi import FastAPI
 from app.routers import astro
 from app.routers import radix  # NEU
 from app.routers import radix_kerykeion
+from app.routers import astrocarto
 
 app = FastAPI(title="Astro API", version="0.3.0")
 app.include_router(astro.router)
 app.include_router(radix.router)
 app.include_router(radix_kerykeion.router)
+app.include_router(astrocarto.router)
 
 @app.get("/")
 def root():
@@ -63,3 +63,36 @@ class PersistRequest(BaseModel):
             # Beide gesetzt ODER beide leer → Fehler
             raise ValueError("Provide exactly one of: person_id OR person.")
         return self
+
+# -------- Astrokartographie --------
+
+class AstroMapRequest(BaseModel):
+    datetime: datetime
+    planets: List[Planet] = [
+        "sun","moon","mercury","venus","mars","jupiter","saturn"
+    ]
+    lat_step: float = Field(1.0, gt=0.0, le=10.0)
+
+class GridRequest(BaseModel):
+    datetime: datetime
+    lat_min: float = Field(-60.0, ge=-90, le=90)
+    lat_max: float = Field(60.0, ge=-90, le=90)
+    lon_min: float = Field(-180.0, ge=-180, le=180)
+    lon_max: float = Field(180.0, ge=-180, le=180)
+    step: float = Field(1.0, gt=0.0, le=30.0)
+
+    @model_validator(mode="after")
+    def _check_ranges(self) -> "GridRequest":
+        if self.lat_min > self.lat_max or self.lon_min > self.lon_max:
+            raise ValueError("lat_min/lon_min must not exceed lat_max/lon_max.")
+        return self
+
+class GridResponse(BaseModel):
+    lats: List[float]
+    lons: List[float]
+    mc: List[float]               # je Länge (unabhängig von der Breite)
+    ascendant: List[List[float]]  # [lat][lon]
+
+class AccuracyRequest(BaseModel):
+    datetime: datetime
+    samples: List[GeoLocation] = Field(..., min_length=1, max_length=500)
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+from datetime import datetime
+import numpy as np
+from app.models.schemas import AstroMapRequest, GridRequest, GridResponse, AccuracyRequest
+from app.services import astrocarto
+
+router = APIRouter(prefix="/v1/astrocarto", tags=["astrocarto"])
+
+_MAX_GRID_POINTS = 1_000_000
+
+@router.post("/lines")
+def lines(req: AstroMapRequest):
+    """MC/IC/ASC/DSC-Linien je Planet als GeoJSON FeatureCollection."""
+    return astrocarto.lines_geojson(req.datetime, req.planets, lat_step=req.lat_step)
+
+@router.post("/grid", response_model=GridResponse)
+def grid(req: GridRequest):
+    # Punktzahl vor dem Allokieren prüfen (kleines step würde sonst riesige Arrays erzeugen)
+    n_lat = int(np.floor((req.lat_max - req.lat_min) / req.step + 1e-9)) + 1
+    n_lon = int(np.floor((req.lon_max - req.lon_min) / req.step + 1e-9)) + 1
+    if n_lat * n_lon > _MAX_GRID_POINTS:
+        raise HTTPException(status_code=422, detail=f"Grid too large (max {_MAX_GRID_POINTS} points)")
+    lats = np.minimum(np.round(req.lat_min + req.step * np.arange(n_lat), 9), req.lat_max)
+    lons = np.minimum(np.round(req.lon_min + req.step * np.arange(n_lon), 9), req.lon_max)
+    m = astrocarto.sidereal_moment(req.datetime)
+    asc = astrocarto.asc_grid(m, lats[:, None], lons[None, :])
+    return GridResponse(
+        lats=lats.tolist(),
+        lons=lons.tolist(),
+        mc=astrocarto.mc_grid(m, lons).tolist(),
+        ascendant=asc.tolist(),
+    )
+
+@router.get("/tiles/asc/{z}/{x}/{y}.png")
+def asc_tile(z: int, x: int, y: int, when: datetime = Query(..., alias="datetime")):
+    """XYZ-Rasterkachel (Web-Mercator): Aszendenten-Zeichen je Pixel."""
+    if not (0 <= z <= 12) or not (0 <= x < 2 ** z) or not (0 <= y < 2 ** z):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+    png = astrocarto.asc_tile_png(when, z, x, y)
+    return Response(content=png, media_type="image/png",
+                    headers={"Cache-Control": "public, max-age=86400"})
+
+@router.post("/accuracy")
+def accuracy(req: AccuracyRequest):
+    """Vergleich Gitter-ASC/MC gegen swe.houses() an den übergebenen Stichproben."""
+    samples = [(s.lat, s.lon) for s in req.samples]
+    return astrocarto.compare_with_swe_houses(req.datetime, samples)
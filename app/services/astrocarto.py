@@ -0,0 +1,238 @@
+# app/services/astrocarto.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Tuple
+import struct
+import zlib
+
+import numpy as np
+import swisseph as swe
+
+from app.models.schemas import Planet
+from app.services.swisseph_provider import _PLANET_MAP, _ensure_ephe_path, _to_julday
+
+_ensure_ephe_path()
+
+# Farbpalette je Tierkreiszeichen (Widder .. Fische) für Raster-Tiles
+_SIGN_RGB = np.array([
+    (230, 57, 70), (141, 153, 74), (244, 162, 97), (69, 123, 157),
+    (233, 196, 106), (106, 153, 78), (231, 111, 81), (120, 40, 31),
+    (188, 108, 37), (96, 108, 56), (42, 157, 143), (29, 53, 87),
+], dtype=np.uint8)
+
+@dataclass(frozen=True)
+class SiderealMoment:
+    """Einmal pro Zeitpunkt berechnete Größen (unabhängig vom Ort)."""
+    jd_ut: float
+    gast_deg: float   # Greenwich Apparent Sidereal Time in Grad
+    eps_deg: float    # wahre Schiefe der Ekliptik
+
+def sidereal_moment(when: datetime) -> SiderealMoment:
+    return _moment_for_jd(_to_julday(when))
+
+@lru_cache(maxsize=256)
+def _moment_for_jd(jd_ut: float) -> SiderealMoment:
+    # swe.houses() rechnet intern mit sidtime*15 + lon und der wahren Schiefe
+    xx, _ = swe.calc_ut(jd_ut, swe.ECL_NUT)
+    return SiderealMoment(jd_ut=jd_ut, gast_deg=swe.sidtime(jd_ut) * 15.0, eps_deg=float(xx[0]))
+
+def mc_grid(m: SiderealMoment, lons: np.ndarray) -> np.ndarray:
+    """MC (ekliptische Länge, 0..360) für ein Array geographischer Längen."""
+    armc = np.radians(m.gast_deg + np.asarray(lons, dtype=float))
+    eps = np.radians(m.eps_deg)
+    return np.degrees(np.arctan2(np.sin(armc), np.cos(armc) * np.cos(eps))) % 360.0
+
+def asc_grid(m: SiderealMoment, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Aszendent (0..360) für ein lat/lon-Gitter; lats und lons werden per Broadcasting
+    kombiniert (z. B. lats[:, None], lons[None, :]).
+    Innerhalb der Polarkreise wird wie in swe.houses() auf den Punkt östlich des MC gespiegelt.
+    An den Polen (±90°) liefert tan(phi) ~ 1.6e16 den Grenzwert 0°/180° wie swe.houses().
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    armc = np.radians(m.gast_deg + lons)
+    eps = np.radians(m.eps_deg)
+    phi = np.radians(lats)
+    asc = np.degrees(np.arctan2(
+        np.cos(armc),
+        -(np.sin(armc) * np.cos(eps) + np.tan(phi) * np.sin(eps)),
+    )) % 360.0
+
+    polar = np.abs(lats) >= 90.0 - m.eps_deg
+    if np.any(polar):
+        mc = mc_grid(m, lons)
+        acmc = (asc - mc + 180.0) % 360.0 - 180.0
+        asc = np.where(polar & (acmc < 0.0), (asc + 180.0) % 360.0, asc)
+    return asc
+
+# ---------------- Planetenlinien (GeoJSON) ----------------
+
+def _equatorial(jd_ut: float, eps_deg: float, planet: Planet) -> Tuple[float, float]:
+    """(Rektaszension, Deklination) in Grad, in mundo aus der wahren ekliptischen Position."""
+    xx, _ = swe.calc_ut(jd_ut, _PLANET_MAP[planet], swe.FLG_SWIEPH)
+    lon, lat = float(xx[0]), float(xx[1])
+    if planet in ("north_node", "south_node"):
+        lat = 0.0
+        if planet == "south_node":
+            lon = (lon + 180.0) % 360.0
+    ra, dec, _ = swe.cotrans((lon, lat, 1.0), -eps_deg)
+    return float(ra), float(dec)
+
+def _wrap180(x: np.ndarray) -> np.ndarray:
+    return (np.asarray(x, dtype=float) + 180.0) % 360.0 - 180.0
+
+def _point(lon: float, lat: float) -> List[float]:
+    return [round(lon, 4), round(lat, 4)]
+
+def _split_antimeridian(lons: np.ndarray, lats: np.ndarray) -> List[List[List[float]]]:
+    """
+    Zerlegt eine Linie in Segmente ohne Sprung über ±180° bzw. ohne Lücken (NaN).
+    An jedem Übergang wird der Schnittpunkt mit ±180° interpoliert und beiden Segmenten angehängt.
+    """
+    segments: List[List[List[float]]] = []
+    current: List[List[float]] = []
+    prev = None
+    for lo, la in zip(lons.tolist(), lats.tolist()):
+        if np.isnan(lo):
+            if len(current) > 1:
+                segments.append(current)
+            current, prev = [], None
+            continue
+        if prev is not None and abs(lo - prev[0]) > 180.0:
+            edge = 180.0 if lo < prev[0] else -180.0   # ostwärts über +180 bzw. westwärts über -180
+            lo_unwrapped = lo + 2.0 * edge
+            t = (edge - prev[0]) / (lo_unwrapped - prev[0])
+            la_x = prev[1] + t * (la - prev[1])
+            current.append(_point(edge, la_x))
+            if len(current) > 1:
+                segments.append(current)
+            current = [_point(-edge, la_x)]
+        current.append(_point(lo, la))
+        prev = (lo, la)
+    if len(current) > 1:
+        segments.append(current)
+    return segments
+
+def planet_lines(m: SiderealMoment, ra: float, dec: float, lat_step: float = 1.0,
+                 max_lat: float = 85.0) -> Dict[str, List[List[List[float]]]]:
+    """
+    MC/IC/ASC/DSC-Linien eines Planeten als Liste von Segmenten [[lon, lat], ...].
+    ASC und DSC enden exakt an der Zirkumpolar-Grenze |phi| = 90 - |dec|, wo sie sich treffen.
+    """
+    n_lat = int(np.floor(2.0 * max_lat / lat_step + 1e-9)) + 1
+    lats = -max_lat + lat_step * np.arange(n_lat)
+    tan_dec = np.tan(np.radians(dec))
+    if tan_dec != 0.0:
+        lat_lim = np.degrees(np.arctan(1.0 / abs(tan_dec)))
+        if lat_lim <= max_lat:
+            lats = np.union1d(lats, [-lat_lim, lat_lim])
+
+    lon_mc = float(_wrap180(ra - m.gast_deg))
+    lon_ic = float(_wrap180(lon_mc + 180.0))
+
+    # Stundenwinkel bei Auf-/Untergang: cos H0 = -tan(phi) * tan(dec)
+    cos_h0 = -np.tan(np.radians(lats)) * tan_dec
+    valid = np.abs(cos_h0) <= 1.0 + 1e-12   # Rundung an der exakten Grenzbreite tolerieren
+    h0 = np.degrees(np.arccos(np.where(valid, np.clip(cos_h0, -1.0, 1.0), np.nan)))
+    lon_asc = _wrap180(ra - h0 - m.gast_deg)
+    lon_dsc = _wrap180(ra + h0 - m.gast_deg)
+
+    return {
+        "MC": [[_point(lon_mc, -max_lat), _point(lon_mc, max_lat)]],
+        "IC": [[_point(lon_ic, -max_lat), _point(lon_ic, max_lat)]],
+        "ASC": _split_antimeridian(lon_asc, lats),
+        "DSC": _split_antimeridian(lon_dsc, lats),
+    }
+
+def lines_geojson(when: datetime, planets: List[Planet], lat_step: float = 1.0) -> dict:
+    """FeatureCollection mit je einer MultiLineString-Feature pro Planet und Achse."""
+    m = sidereal_moment(when)
+    features = []
+    for p in planets:
+        ra, dec = _equatorial(m.jd_ut, m.eps_deg, p)
+        for angle, segments in planet_lines(m, ra, dec, lat_step=lat_step).items():
+            if not segments:
+                continue
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "MultiLineString", "coordinates": segments},
+                "properties": {"planet": p, "angle": angle, "ra": ra, "dec": dec},
+            })
+    return {"type": "FeatureCollection", "features": features}
+
+# ---------------- Raster-Tiles (Web-Mercator, XYZ) ----------------
+
+TILE_SIZE = 256
+
+def _tile_latlon(z: int, x: int, y: int, size: int = TILE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """Pixelzentren einer XYZ-Kachel als (lats, lons) 1D-Arrays."""
+    n = 2 ** z
+    px = (np.arange(size) + 0.5) / size
+    lons = (x + px) / n * 360.0 - 180.0
+    merc_y = np.pi * (1.0 - 2.0 * (y + px) / n)
+    lats = np.degrees(np.arctan(np.sinh(merc_y)))
+    return lats, lons
+
+def _encode_png(rgb: np.ndarray) -> bytes:
+    """Minimaler PNG-Encoder (8-bit RGB, ohne Filter) – kein Pillow nötig."""
+    h, w, _ = rgb.shape
+    raw = np.hstack([np.zeros((h, 1), dtype=np.uint8), rgb.reshape(h, w * 3)]).tobytes()
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 6))
+        + chunk(b"IEND", b"")
+    )
+
+def asc_tile_png(when: datetime, z: int, x: int, y: int) -> bytes:
+    """Kachel mit dem Aszendenten-Zeichen je Pixel, eingefärbt nach Tierkreiszeichen."""
+    return _asc_tile_cached(_to_julday(when), z, x, y)
+
+@lru_cache(maxsize=512)
+def _asc_tile_cached(jd_ut: float, z: int, x: int, y: int) -> bytes:
+    m = _moment_for_jd(jd_ut)
+    lats, lons = _tile_latlon(z, x, y)
+    asc = asc_grid(m, lats[:, None], lons[None, :])
+    sign = (asc // 30.0).astype(np.intp) % 12
+    return _encode_png(_SIGN_RGB[sign])
+
+# ---------------- Genauigkeitsvergleich gegen swe.houses ----------------
+
+def _angdiff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.abs((np.asarray(a) - np.asarray(b) + 180.0) % 360.0 - 180.0)
+
+def compare_with_swe_houses(when: datetime, samples: List[Tuple[float, float]]) -> dict:
+    """Vergleicht Gitter-ASC/MC mit swe.houses() an Stichprobenpunkten (lat, lon)."""
+    m = sidereal_moment(when)
+    lats = np.array([s[0] for s in samples], dtype=float)
+    lons = np.array([s[1] for s in samples], dtype=float)
+    asc = asc_grid(m, lats, lons)
+    mc = mc_grid(m, lons)
+
+    # Porphyry statt Placidus: ASC/MC sind systemunabhängig, "P" wirft in Polarnähe einen Fehler
+    ref_asc, ref_mc = [], []
+    for la, lo in samples:
+        _, ascmc = swe.houses(m.jd_ut, float(la), float(lo), b"O")
+        ref_asc.append(float(ascmc[0]))
+        ref_mc.append(float(ascmc[1]))
+
+    d_asc = _angdiff(asc, ref_asc)
+    d_mc = _angdiff(mc, ref_mc)
+    points = [
+        {"lat": float(la), "lon": float(lo), "asc": float(a), "asc_ref": ra,
+         "mc": float(c), "mc_ref": rc, "asc_diff_deg": float(da), "mc_diff_deg": float(dm)}
+        for la, lo, a, ra, c, rc, da, dm in zip(lats, lons, asc, ref_asc, mc, ref_mc, d_asc, d_mc)
+    ]
+    return {
+        "max_asc_diff_deg": float(d_asc.max()),
+        "max_mc_diff_deg": float(d_mc.max()),
+        "points": points,
+    }